@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# benchmarks every part on generated inputs of growing size and fits the scaling
+#
+#   python 2021/bench.py -o base.json                  all days
+#   python 2021/bench.py 1 7 11 --compare base.json    fail on slowdowns against a baseline
+#
+# sizes are the generate.py sizes, so the exponent of grid days is in the side length
+from typing import Dict, List, Optional, Tuple
+from pathlib import Path
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import math
+import subprocess
+import sys
+import time
+
+import generate
+
+SIZES: Dict[int, List[int]] = {
+    1: [2000, 4000, 8000, 16000],
+    2: [10000, 20000, 40000, 80000],
+    3: [1000, 2000, 4000, 8000],
+    4: [25, 50, 100, 200],
+    5: [250, 500, 1000, 2000],
+    6: [1000, 2000, 4000, 8000],
+    7: [100, 200, 400, 800],
+    8: [250, 500, 1000, 2000],
+    9: [20, 40, 80, 160],
+    10: [250, 500, 1000, 2000],
+    11: [10, 20, 30, 40],
+    # smaller cave systems finish below NOISE_FLOOR, p12b takes seconds at 20
+    12: [14, 16, 18, 20],
+    13: [250, 500, 1000, 2000],
+    14: [100, 200, 400, 800],
+    15: [10, 20, 40, 80],
+}
+
+# random octopus grids need not ever flash in sync, so part2 might never return
+SKIP: List[str] = ["p11b"]
+
+Result = Dict[str, object]
+
+# timings below this are mostly noise and never count as a regression
+NOISE_FLOOR: float = 1e-3
+
+
+def measure(function, repeat: int) -> float:
+    best = math.inf
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            function()
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+def fit_exponent(sizes: List[int], seconds: List[float]) -> float:
+    # least squares slope in log-log space, t ~ c * n^k
+    points = [(math.log(size), math.log(max(second, 1e-9)))
+              for size, second in zip(sizes, seconds)]
+    if len(points) < 2:
+        return math.nan
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    variance = sum((x - mean_x) ** 2 for x, _ in points)
+    covariance = sum((x - mean_x) * (y - mean_y) for x, y in points)
+    return covariance / variance
+
+
+def bench_day(day: int, sizes: List[int], repeat: int, budget: float) -> Dict[str, Result]:
+    module = importlib.import_module(f"p{day}")
+    results: Dict[str, Result] = {}
+    for part, name in enumerate(["a", "b"]):
+        key = f"p{day}{name}"
+        if key in SKIP:
+            continue
+        measured: List[Tuple[int, float]] = []
+        for size in sizes:
+            function = module.parts(generate.lines(day, size))[part]
+            measured.append((size, measure(function, repeat)))
+            # growing further would only take longer
+            if measured[-1][1] > budget:
+                break
+        results[key] = {
+            "sizes": [size for size, _ in measured],
+            "seconds": [second for _, second in measured],
+            "exponent": fit_exponent(*zip(*measured)),
+        }
+    return results
+
+
+def revision() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, cwd=Path(__file__).parent, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(base: Dict[str, Result], current: Dict[str, Result], tolerance: float) -> List[str]:
+    regressions: List[str] = []
+    for key in sorted(set(base) & set(current)):
+        old_times = dict(zip(base[key]["sizes"], base[key]["seconds"]))
+        for size, second in zip(current[key]["sizes"], current[key]["seconds"]):
+            if size in old_times and old_times[size] >= NOISE_FLOOR \
+                    and second > old_times[size] * (1 + tolerance):
+                regressions.append(
+                    f"{key} n={size}: {old_times[size] * 1000:.2f} ms -> {second * 1000:.2f} ms")
+        # a worse complexity class shows up in the exponent even if the small sizes are fast
+        if current[key]["exponent"] > base[key]["exponent"] + 0.5:
+            regressions.append(
+                f"{key}: scaling n^{base[key]['exponent']:.2f} -> n^{current[key]['exponent']:.2f}")
+    # parts that ran in the baseline but did not run now
+    regressions += [f"{key}: no longer measured" for key in sorted(set(base) - set(current))]
+    return regressions
+
+
+def report(results: Dict[str, Result]):
+    for key, result in results.items():
+        times = " ".join(f"{size}:{second * 1000:.2f}ms" for size, second in
+                         zip(result["sizes"], result["seconds"]))
+        print(f"{key:>5} n^{result['exponent']:<5.2f} {times}")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="benchmark all parts")
+    parser.add_argument("days", nargs="*", type=int, help="days to run, all by default")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per size, the fastest counts")
+    parser.add_argument("--budget", type=float, default=5.0,
+                        help="seconds after which a part is not run on larger sizes")
+    parser.add_argument("-o", "--output", help="write results as json")
+    parser.add_argument("--compare", help="baseline json to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed relative slowdown against the baseline")
+    args = parser.parse_args(argv)
+
+    results: Dict[str, Result] = {}
+    for day in args.days or sorted(SIZES):
+        results.update(bench_day(day, SIZES[day], args.repeat, args.budget))
+    report(results)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(
+            {"revision": revision(), "results": results}, indent=2))
+
+    if args.compare:
+        base = json.loads(Path(args.compare).read_text())
+        # only compare what was run this time
+        base_results = {key: result for key, result in base["results"].items()
+                        if int(key[1:-1]) in (args.days or SIZES)}
+        regressions = compare(base_results, results, args.tolerance)
+        for regression in regressions:
+            print(f"regression {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+# seeded synthetic puzzle inputs of arbitrary size, written line by line
+#
+#   python 2021/generate.py 9 5000                      5000x5000 height map to stdout
+#   python 2021/generate.py 4 100000 --inputs /tmp/big  into the store layout of inputs.py
+#
+# the meaning of size depends on the day, see the generator docstrings
+from typing import Callable, Dict, List, Optional, TextIO
+from pathlib import Path
+import argparse
+import io
+import random
+import string
+import sys
+
+import inputs
+
+Generator = Callable[[TextIO, int, random.Random], None]
+
+
+def p1(out: TextIO, size: int, rng: random.Random):
+    """size depth readings, a random walk that mostly goes down"""
+    depth = rng.randint(100, 200)
+    for _ in range(size):
+        depth = max(0, depth + rng.randint(-10, 15))
+        out.write(f"{depth}\n")
+
+
+def p2(out: TextIO, size: int, rng: random.Random):
+    """size submarine commands"""
+    for direction in rng.choices(["forward", "down", "up"], [4, 3, 2], k=size):
+        out.write(f"{direction} {rng.randint(1, 9)}\n")
+
+
+def p3(out: TextIO, size: int, rng: random.Random):
+    """size distinct reports, at least 12 bits wide
+
+    every group of reports sharing a prefix has both bits at the next column,
+    so neither rating search can run out of candidates
+    """
+    width = max(12, (size - 1).bit_length())
+
+    def emit(prefix: int, count: int, remaining: int):
+        if remaining == 0:
+            out.write(f"{prefix:0{width}b}\n")
+            return
+        half = 1 << (remaining - 1)
+        if count == 1:
+            ones = rng.randint(0, 1)
+        else:
+            ones = rng.randint(max(1, count - half), min(count - 1, half))
+        children = [(0, count - ones), (1, ones)]
+        rng.shuffle(children)
+        for bit, child_count in children:
+            if child_count:
+                emit((prefix << 1) | bit, child_count, remaining - 1)
+
+    if size:
+        emit(0, size, width)
+
+
+def p4(out: TextIO, size: int, rng: random.Random, side: int = 5):
+    """size bingo boards of side x side, every number gets drawn"""
+    numbers = max(100, side * side)
+    drawn = list(range(numbers))
+    rng.shuffle(drawn)
+    out.write(",".join(map(str, drawn)) + "\n")
+    for _ in range(size):
+        cells = rng.sample(range(numbers), side * side)
+        out.write("\n")
+        for row in range(side):
+            out.write(" ".join(f"{cell:2}" for cell in cells[row * side:(row + 1) * side]) + "\n")
+
+
+def p5(out: TextIO, size: int, rng: random.Random, extent: int = 1000):
+    """size vent lines inside an extent x extent grid, a third of them diagonal"""
+    for _ in range(size):
+        x1, y1 = rng.randrange(extent), rng.randrange(extent)
+        kind = rng.randrange(3)
+        if kind == 0:
+            x2, y2 = rng.randrange(extent), y1
+        elif kind == 1:
+            x2, y2 = x1, rng.randrange(extent)
+        else:
+            dx, dy = rng.choice([1, -1]), rng.choice([1, -1])
+            limit_x = extent - 1 - x1 if dx > 0 else x1
+            limit_y = extent - 1 - y1 if dy > 0 else y1
+            length = rng.randint(0, min(limit_x, limit_y))
+            x2, y2 = x1 + dx * length, y1 + dy * length
+        out.write(f"{x1},{y1} -> {x2},{y2}\n")
+
+
+def p6(out: TextIO, size: int, rng: random.Random):
+    """size lanternfish timers on one line"""
+    out.write(",".join(str(rng.randint(1, 5)) for _ in range(size)) + "\n")
+
+
+def p7(out: TextIO, size: int, rng: random.Random, extent: int = 0):
+    """size crab positions below extent on one line
+
+    the extent defaults to twice the crab count, like the puzzle input
+    """
+    extent = extent or 2 * size
+    out.write(",".join(str(rng.randrange(extent)) for _ in range(size)) + "\n")
+
+
+# canonical segments of the seven segment digits 0-9
+DIGITS: List[str] = ["abcefg", "cf", "acdeg", "acdfg", "bcdf",
+                     "abdfg", "abdefg", "acf", "abcdefg", "abcdfg"]
+
+
+def p8(out: TextIO, size: int, rng: random.Random):
+    """size displays, each with its own random wiring"""
+    def scramble(pattern: str, wiring: Dict[str, str]) -> str:
+        wired = [wiring[segment] for segment in pattern]
+        rng.shuffle(wired)
+        return "".join(wired)
+
+    for _ in range(size):
+        wiring = dict(zip("abcdefg", rng.sample("abcdefg", 7)))
+        patterns = [scramble(digit, wiring) for digit in DIGITS]
+        rng.shuffle(patterns)
+        outputs = [scramble(DIGITS[rng.randrange(10)], wiring)
+                   for _ in range(4)]
+        out.write(f"{' '.join(patterns)} | {' '.join(outputs)}\n")
+
+
+def p9(out: TextIO, size: int, rng: random.Random):
+    """size x size height map, about a fifth of it basin walls of height 9"""
+    for _ in range(size):
+        out.write("".join("9" if rng.random() < 0.2 else str(rng.randrange(9))
+                          for _ in range(size)) + "\n")
+
+
+def p10(out: TextIO, size: int, rng: random.Random, length: int = 100):
+    """size navigation lines, either corrupted or incomplete"""
+    pairs = {"(": ")", "[": "]", "{": "}", "<": ">"}
+    for _ in range(size):
+        chars: List[str] = []
+        scopes: List[str] = []
+        for _ in range(length):
+            if scopes and rng.random() < 0.45:
+                chars.append(pairs[scopes.pop()])
+            else:
+                scopes.append(rng.choice("([{<"))
+                chars.append(scopes[-1])
+        if not scopes:
+            scopes.append(rng.choice("([{<"))
+            chars.append(scopes[-1])
+        if rng.random() < 0.5:
+            # close the innermost scope with a wrong bracket
+            chars.append(rng.choice(
+                [close for open, close in pairs.items() if open != scopes[-1]]))
+        out.write("".join(chars) + "\n")
+
+
+def p11(out: TextIO, size: int, rng: random.Random):
+    """size x size octopus energy levels"""
+    for _ in range(size):
+        out.write("".join(str(rng.randrange(10)) for _ in range(size)) + "\n")
+
+
+def p12(out: TextIO, size: int, rng: random.Random, density: float = 1.5):
+    """size small caves, size // 4 big caves and density * size passages
+
+    big caves are never connected to each other, which would allow endless paths
+    """
+    small = [a + b for a in string.ascii_lowercase for b in string.ascii_lowercase]
+    big = [name.upper() for name in small]
+    small, big = small[:size], big[:max(1, size // 4)]
+    caves = ["start", "end"] + small + big
+    edges = set()
+    for cave in ["start", "end"] + big:
+        edges.add(tuple(sorted((cave, rng.choice(small)))))
+    possible = len(caves) * (len(caves) - 1) // 2 - len(big) * (len(big) - 1) // 2
+    while len(edges) < min(possible, int(density * size)):
+        a, b = rng.sample(caves, 2)
+        if not (a in big and b in big):
+            edges.add(tuple(sorted((a, b))))
+    for a, b in sorted(edges):
+        out.write(f"{a}-{b}\n")
+
+
+def p13(out: TextIO, size: int, rng: random.Random, folds: int = 12):
+    """size dots on paper that is folded folds times down to 40x6"""
+    width, height = 40, 6
+    fold_lines: List[str] = []
+    for i in range(folds):
+        if i % 2 == 0:
+            fold_lines.append(f"fold along x={width}")
+            width = 2 * width + 1
+        else:
+            fold_lines.append(f"fold along y={height}")
+            height = 2 * height + 1
+    # dots never lie on any fold line
+    xs = [int(line[13:]) for line in fold_lines if line[11] == "x"]
+    ys = [int(line[13:]) for line in fold_lines if line[11] == "y"]
+    for _ in range(size):
+        x, y = rng.randrange(width), rng.randrange(height)
+        while any((x + 1) % (fold + 1) == 0 for fold in xs):
+            x = rng.randrange(width)
+        while any((y + 1) % (fold + 1) == 0 for fold in ys):
+            y = rng.randrange(height)
+        out.write(f"{x},{y}\n")
+    out.write("\n")
+    for line in reversed(fold_lines):
+        out.write(line + "\n")
+
+
+def p14(out: TextIO, size: int, rng: random.Random, elements: str = "BCFHKNOPSV"):
+    """size long polymer template and an insertion rule for every pair"""
+    out.write("".join(rng.choice(elements) for _ in range(size)) + "\n\n")
+    for a in elements:
+        for b in elements:
+            out.write(f"{a}{b} -> {rng.choice(elements)}\n")
+
+
+def p15(out: TextIO, size: int, rng: random.Random):
+    """size x size risk levels"""
+    for _ in range(size):
+        out.write("".join(str(rng.randint(1, 9)) for _ in range(size)) + "\n")
+
+
+GENERATORS: Dict[int, Generator] = {
+    1: p1, 2: p2, 3: p3, 4: p4, 5: p5, 6: p6, 7: p7, 8: p8,
+    9: p9, 10: p10, 11: p11, 12: p12, 13: p13, 14: p14, 15: p15,
+}
+
+
+def generate(day: int, size: int, out: TextIO, seed: int = 0):
+    GENERATORS[day](out, size, random.Random(f"{day} {size} {seed}"))
+
+
+def lines(day: int, size: int, seed: int = 0) -> List[str]:
+    # in memory, for benchmarks and tests on small and medium sizes
+    buffer = io.StringIO()
+    generate(day, size, buffer, seed)
+    return buffer.getvalue().splitlines()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="generate puzzle inputs")
+    parser.add_argument("day", type=int, choices=sorted(GENERATORS))
+    parser.add_argument("size", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--inputs", help="input store root to write into, stdout by default")
+    args = parser.parse_args(argv)
+
+    if args.inputs:
+        target = Path(args.inputs) / str(inputs.YEAR) / f"{args.day}.txt"
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with open(target, "w", buffering=1 << 20) as out:
+            generate(args.day, args.size, out, args.seed)
+        print(target)
+    else:
+        generate(args.day, args.size, sys.stdout, args.seed)
+
+
+if __name__ == "__main__":
+    main()
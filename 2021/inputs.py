@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# offline puzzle input store, replaces the import-time data fetching of aocd
+#
+# inputs live in $AOC_INPUTS (default: inputs/ next to this folder) as
+#   <year>/<day>.txt       raw puzzle input
+#   <year>/<day>.sha256    content hash, reused while size and mtime match
+#   .cache/<hash>.lines    marshalled List[str]
+#   .cache/<hash>.numbers  packed int64 array
+from typing import Dict, List, Optional, Tuple
+from array import array
+from pathlib import Path
+import hashlib
+import marshal
+import mmap
+import os
+import sys
+import tempfile
+
+YEAR: int = 2021
+
+# files above this size are memory mapped instead of read into a bytes object
+MMAP_THRESHOLD: int = 1 << 20
+
+
+def root() -> Path:
+    return Path(os.environ.get("AOC_INPUTS", Path(__file__).resolve().parent.parent / "inputs"))
+
+
+def path(day: int, year: int = YEAR) -> Path:
+    return root() / str(year) / f"{day}.txt"
+
+
+def add(day: int, data: str, year: int = YEAR) -> Path:
+    target = path(day, year)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(data)
+    return target
+
+
+def fetch(day: int, year: int = YEAR) -> Path:
+    # the only place that may touch the network, and only if the input is missing
+    target = path(day, year)
+    if not target.exists():
+        try:
+            import aocd
+        except ImportError:
+            raise FileNotFoundError(
+                f"no input for {year} day {day} at {target} and aocd is not installed")
+        add(day, aocd.get_data(day=day, year=year), year)
+    return target
+
+
+class _Mapped:
+    # read-only view of a file, memory mapped if it is large
+    def __init__(self, file: Path):
+        self.handle = open(file, "rb")
+        size = os.fstat(self.handle.fileno()).st_size
+        if size >= MMAP_THRESHOLD:
+            self.data = mmap.mmap(
+                self.handle.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self.data = self.handle.read()
+
+    def __enter__(self):
+        return self.data
+
+    def __exit__(self, *_):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self.handle.close()
+
+
+def content_hash(day: int, year: int = YEAR) -> str:
+    source = fetch(day, year)
+    stamp = source.with_suffix(".sha256")
+    stat = source.stat()
+    key = f"{stat.st_size} {stat.st_mtime_ns}"
+    if stamp.exists():
+        stored_key, _, digest = stamp.read_text().rpartition(" ")
+        if stored_key == key:
+            return digest
+    with _Mapped(source) as data:
+        digest = hashlib.sha256(data).hexdigest()
+    _store(stamp, f"{key} {digest}".encode())
+    return digest
+
+
+def _cache_file(digest: str, kind: str) -> Path:
+    return root() / ".cache" / f"{digest}.{kind}"
+
+
+def _store(file: Path, payload: bytes):
+    file.parent.mkdir(parents=True, exist_ok=True)
+    # write to a temporary file first so a crash never leaves a truncated cache. the
+    # name is unique per writer, both parts of a day may fill a fresh store at once
+    handle, temp = tempfile.mkstemp(prefix=file.name + ".", suffix=".tmp", dir=file.parent)
+    try:
+        with os.fdopen(handle, "wb") as out:
+            out.write(payload)
+        os.replace(temp, file)
+    except BaseException:
+        os.unlink(temp)
+        raise
+
+
+def _split(day: int, year: int) -> List[str]:
+    with _Mapped(fetch(day, year)) as data:
+        return str(data, "utf-8").splitlines()
+
+
+def _load_lines(day: int, year: int) -> List[str]:
+    cache = _cache_file(content_hash(day, year), "lines")
+    if cache.exists():
+        return marshal.loads(cache.read_bytes())
+    split = _split(day, year)
+    _store(cache, marshal.dumps(split))
+    return split
+
+
+def _load_numbers(day: int, year: int) -> List[int]:
+    cache = _cache_file(content_hash(day, year), "numbers")
+    if cache.exists():
+        packed = array("q")
+        packed.frombytes(cache.read_bytes())
+        return packed.tolist()
+    # like [int(n) for n in data.splitlines()]
+    parsed = [int(line) for line in _load_lines(day, year)]
+    try:
+        _store(cache, array("q", parsed).tobytes())
+    except OverflowError:
+        # does not fit into int64, only the cached lines are reused
+        pass
+    return parsed
+
+
+# per process memo, so each input is read at most once and only on first access
+_loaded: Dict[Tuple[str, int, int], list] = {}
+
+
+def _memo(kind: str, loader, day: int, year: int) -> list:
+    key = (kind, day, year)
+    if key not in _loaded:
+        _loaded[key] = loader(day, year)
+    return _loaded[key]
+
+
+def data(day: int, year: int = YEAR) -> str:
+    return "\n".join(lines(day, year))
+
+
+def lines(day: int, year: int = YEAR) -> List[str]:
+    return _memo("lines", _load_lines, day, year)
+
+
+def numbers(day: int, year: int = YEAR) -> List[int]:
+    return _memo("numbers", _load_numbers, day, year)
+
+
+def main(argv: Optional[List[str]] = None):
+    # store an input: inputs.py <day> [file], reads stdin without a file
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print("usage: inputs.py <day> [file]", file=sys.stderr)
+        sys.exit(2)
+    day = int(argv[0])
+    text = Path(argv[1]).read_text() if len(argv) > 1 else sys.stdin.read()
+    print(add(day, text))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# opt-in profiling of the part functions
+#
+#   AOC_PROFILE=profiles python 2021/run.py 9    or    python 2021/run.py 9 --profile profiles
+#   python 2021/instrument.py 15                  runs p15.main() instrumented, AOC_PROFILE or profiles/
+#
+# for every part1/part2/solution call this collects cProfile stats (<tag>.<function>.prof),
+# sampled stacks in collapsed format for flamegraph.pl/speedscope (<tag>.<function>.folded)
+# and call counts of the hot helpers below (<tag>.counts.json).
+# nothing is wrapped unless install() is called, so with profiling off there is no overhead.
+from typing import Callable, Dict, List, Optional
+from collections import Counter
+from pathlib import Path
+import cProfile
+import functools
+import importlib
+import json
+import os
+import sys
+import threading
+import time
+
+ENVIRONMENT: str = "AOC_PROFILE"
+
+ENTRY_POINTS: List[str] = ["part1", "part2", "solution"]
+
+# helpers that run once per cell, neighbour or element
+HOT: Dict[str, List[str]] = {
+    "p1": ["part1_reducer", "part2_reducer"],
+    "p4": ["occurences", "won", "unmarked_board_sum"],
+    "p5": ["combine", "elementwise", "sign"],
+    "p8": ["contained_in", "list_to_str", "map_output"],
+    "p9": ["sample", "is_low_point", "elementwise"],
+    "p11": ["iteration"],
+    "p12": ["recurse"],
+    "p13": ["fold", "combine_lists"],
+    "p14": ["expand"],
+    "p15": ["combine_tuples", "point", "index", "increase_risk"],
+}
+
+_profiles: Dict[str, cProfile.Profile] = {}
+_stacks: Dict[str, Counter] = {}
+_counts: Counter = Counter()
+_installed: List[str] = []
+# entry points call each other (p1.part2 calls part1), only the outermost call is profiled
+_depth: int = 0
+
+
+def enabled() -> bool:
+    return bool(os.environ.get(ENVIRONMENT))
+
+
+def directory() -> Path:
+    return Path(os.environ.get(ENVIRONMENT) or "profiles")
+
+
+class Sampler(threading.Thread):
+    # samples the stack of another thread, cProfile only knows callers one level up.
+    # one sampler per process, started by install() before run.py lowers the memory
+    # ceiling, a thread cannot start under a tight one
+    def __init__(self, interval: float = 0.001):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.lock = threading.Lock()
+        # (thread, root frame, stacks) while an entry point runs
+        self.target = None
+
+    def begin(self, thread: int, root, stacks: Counter):
+        # stacks are cut at the root frame, the runner and pool frames below it are noise
+        with self.lock:
+            self.target = (thread, root, stacks)
+
+    def end(self):
+        with self.lock:
+            self.target = None
+
+    def run(self):
+        while True:
+            time.sleep(self.interval)
+            with self.lock:
+                if self.target is None:
+                    continue
+                thread, root, stacks = self.target
+                frame = sys._current_frames().get(thread)
+                names: List[str] = []
+                while frame is not None and frame is not root:
+                    module = frame.f_globals.get("__name__", "?")
+                    if module != __name__:
+                        names.append(f"{module}.{frame.f_code.co_name}")
+                    frame = frame.f_back
+                stacks[";".join(reversed(names))] += 1
+
+
+_sampler: Optional[Sampler] = None
+
+
+def _profiled(key: str, function: Callable) -> Callable:
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        global _depth
+        if _depth:
+            return function(*args, **kwargs)
+        _depth += 1
+        profile = _profiles.setdefault(key, cProfile.Profile())
+        _sampler.begin(threading.get_ident(), sys._getframe(), _stacks.setdefault(key, Counter()))
+        profile.enable()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            profile.disable()
+            _sampler.end()
+            _depth -= 1
+    return wrapper
+
+
+def _counted(key: str, function: Callable) -> Callable:
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        _counts[key] += 1
+        return function(*args, **kwargs)
+    return wrapper
+
+
+def install(module):
+    # functions look each other up as module globals, so replacing the attributes is enough
+    global _sampler
+    if _sampler is None:
+        _sampler = Sampler()
+        _sampler.start()
+    name = module.__name__
+    if name in _installed:
+        return
+    _installed.append(name)
+    for helper in HOT.get(name, []):
+        setattr(module, helper, _counted(f"{name}.{helper}", getattr(module, helper)))
+    for entry in ENTRY_POINTS:
+        if hasattr(module, entry):
+            setattr(module, entry, _profiled(f"{name}.{entry}", getattr(module, entry)))
+
+
+def dump(tag: str, target: Optional[Path] = None) -> Path:
+    target = target or directory()
+    target.mkdir(parents=True, exist_ok=True)
+    for key, profile in _profiles.items():
+        profile.dump_stats(str(target / f"{tag}.{key}.prof"))
+    for key, stacks in _stacks.items():
+        with open(target / f"{tag}.{key}.folded", "w") as out:
+            for stack, count in stacks.most_common():
+                out.write(f"{stack} {count}\n")
+    (target / f"{tag}.counts.json").write_text(
+        json.dumps(dict(_counts.most_common()), indent=2))
+    return target
+
+
+def main(argv: Optional[List[str]] = None):
+    days = [int(day) for day in (sys.argv[1:] if argv is None else argv)]
+    for day in days:
+        module = importlib.import_module(f"p{day}")
+        install(module)
+        module.main()
+        print(f"profile written to {dump(f'p{day}')}")
+
+
+if __name__ == "__main__":
+    main()
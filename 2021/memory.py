@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# memory accounting and ceilings for the part functions
+#
+#   python 2021/run.py 15 --memory                        traced peak, retained and top sites per part
+#   python 2021/run.py --memory-limit 512 --memory-limit 15=2048   fail parts that exceed their budget
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from collections import namedtuple
+import contextlib
+import resource
+import threading
+import tracemalloc
+
+Usage = namedtuple('Usage', ['peak', 'retained', 'sites'])
+
+# traceback depth of the allocation sites, one frame is the line that allocated
+FRAMES: int = 1
+
+
+class PeakSnapshots(threading.Thread):
+    # tracemalloc only tracks the peak size, so snapshot whenever a new high is reached
+    def __init__(self, interval: float = 0.01, growth: float = 1.1):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.growth = growth
+        self.highest = 0
+        self.snapshot: Optional[tracemalloc.Snapshot] = None
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            current, _ = tracemalloc.get_traced_memory()
+            if current > self.highest * self.growth:
+                self.highest = current
+                try:
+                    self.snapshot = tracemalloc.take_snapshot()
+                except MemoryError:
+                    # over the ceiling, the part itself will fail the same way
+                    return
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+def top_sites(snapshot: tracemalloc.Snapshot, count: int) -> List[Tuple[str, int]]:
+    # leave out the allocations of the snapshot thread itself
+    own = [tracemalloc.Filter(False, pattern) for pattern in
+           [__file__, threading.__file__, "*/_weakrefset.py"]]
+    statistics = snapshot.filter_traces(own).statistics("lineno")
+    return [(str(statistic.traceback), statistic.size) for statistic in statistics[:count]]
+
+
+def measure(function: Callable[[], Any], sites: int = 5,
+            budget: Optional[int] = None) -> Tuple[Any, Usage]:
+    # the snapshot thread starts before the ceiling, a thread cannot start under a tight one
+    tracemalloc.start(FRAMES)
+    before, _ = tracemalloc.get_traced_memory()
+    sampler = PeakSnapshots()
+    try:
+        sampler.start()
+        with ceiling(budget):
+            result = function()
+    except BaseException:
+        if sampler.is_alive():
+            sampler.stop()
+        tracemalloc.stop()
+        raise
+    sampler.stop()
+    after, peak = tracemalloc.get_traced_memory()
+    # the part is short or did not grow since the last sample, use what it retained
+    snapshot = sampler.snapshot or tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    return result, Usage(peak - before, after - before, top_sites(snapshot, sites))
+
+
+def address_space() -> Optional[int]:
+    # virtual size of this process in bytes, None where /proc is missing
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[0]) * resource.getpagesize()
+    except OSError:
+        return None
+
+
+@contextlib.contextmanager
+def ceiling(budget: Optional[int]):
+    # caps the address space of this process at what is mapped now plus budget, so the
+    # budget is what the part may map on top of the interpreter and its imports (numpy
+    # alone maps about 100 MiB). space the allocator reserved earlier is reused without
+    # counting. allocations beyond raise MemoryError. without /proc the budget is the
+    # whole address space. start threads before entering, a new thread needs address
+    # space for its stack
+    if not budget:
+        yield
+        return
+    limit = budget + (address_space() or 0)
+    soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+    try:
+        yield
+    finally:
+        # reporting the failure needs memory too
+        resource.setrlimit(resource.RLIMIT_AS, (soft, hard))
+
+
+def parse_limits(specs: List[str]) -> Tuple[Optional[int], Dict[int, int]]:
+    # "512" is the default budget in MiB, "15=2048" the budget of one day
+    default: Optional[int] = None
+    per_day: Dict[int, int] = {}
+    for spec in specs:
+        if "=" in spec:
+            day, mib = spec.split("=")
+            per_day[int(day)] = int(mib) << 20
+        else:
+            default = int(spec) << 20
+    return default, per_day
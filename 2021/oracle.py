@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# differential testing of faster engines against the readable reference solutions
+#
+#   python 2021/oracle.py                  every registered pair
+#   python 2021/oracle.py 1 --trials 500   more trials for one day
+#
+# inputs come from generate.py with growing sizes. a mismatch is shrunk by dropping
+# input lines (or the items of a one line input) while the reference still accepts it
+# and the two functions still disagree.
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from collections import namedtuple
+import argparse
+import contextlib
+import importlib
+import io
+import random
+import sys
+
+import generate
+
+# reference function name and candidate function name per day
+PAIRS: Dict[int, List[Tuple[str, str]]] = {
+    1: [("part1", "part1_quick"), ("part2", "part2_quick"),
+        ("part1", "part1_stream"), ("part2", "part2_stream"),
+        ("part1", "part1_numpy"), ("part2", "part2_numpy")],
+    2: [("part1", "part1_quick"), ("part2", "part2_quick"),
+        ("part1", "part1_numpy"), ("part2", "part2_numpy"),
+        ("part1", "part1_parallel"), ("part2", "part2_parallel"),
+        ("part2_states", "trajectory")],
+    3: [("part1", "part1_packed"), ("part2", "part2_packed"), ("part2", "part2_trie")],
+    4: [("part1", "part1_indexed"), ("part2", "part2_indexed"),
+        ("part1", "part1_numpy"), ("part2", "part2_numpy"),
+        ("part1", "part1_stream"), ("part2", "part2_stream")],
+    5: [("part1_dense", "part1"), ("part2_dense", "part2"),
+        ("part1_dense", "part1_numpy"), ("part2_dense", "part2_numpy"),
+        ("part1_dense", "part1_sparse"), ("part2_dense", "part2_sparse"),
+        ("part2_dense", "part2_indexed")],
+    6: [("solution", "solution_matrix")],
+    7: [("part1", "part1_median"), ("part2", "part2_mean"),
+        ("part1", "part1_curve"), ("part2", "part2_curve")],
+    8: [("part1", "part1_masks"), ("part2", "part2_masks"),
+        ("part1", "part1_stream"), ("part2", "part2_stream"), ("part2", "part2_cached")],
+}
+
+# positional arguments of both functions, from the module and the input lines
+ARGUMENTS: Dict[int, Callable[[Any, List[str]], tuple]] = {
+    1: lambda module, lines: ([int(line) for line in lines],),
+    2: lambda module, lines: (module.parse(lines),),
+    3: lambda module, lines: (module.parse(lines),),
+    4: lambda module, lines: tuple(reversed(module.parse(lines))),
+    5: lambda module, lines: module.parse_input(lines),
+    6: lambda module, lines: (module.parse(lines), 256),
+    7: lambda module, lines: (module.parse(lines),),
+    8: lambda module, lines: (module.parse(lines),),
+}
+
+# arguments of candidates that take another input format than their reference
+CANDIDATE_ARGUMENTS: Dict[str, Callable[[Any, List[str]], tuple]] = {
+    "p1.part1_numpy": lambda module, lines: (module.parse_array(lines),),
+    "p1.part2_numpy": lambda module, lines: (module.parse_array(lines),),
+    "p2.part1_numpy": lambda module, lines: module.parse_arrays(lines),
+    "p2.part2_numpy": lambda module, lines: module.parse_arrays(lines),
+    "p2.part1_parallel": lambda module, lines: (lines, 2),
+    "p2.part2_parallel": lambda module, lines: (lines, 2),
+    "p2.trajectory": lambda module, lines: (lines, 2),
+    "p3.part1_packed": lambda module, lines: module.parse_packed(lines),
+    "p3.part2_packed": lambda module, lines: module.parse_packed(lines),
+    "p4.part1_indexed": lambda module, lines: (module.parse_indexed(lines),),
+    "p4.part2_indexed": lambda module, lines: (module.parse_indexed(lines),),
+    "p4.part1_numpy": lambda module, lines: module.parse_arrays(lines),
+    "p4.part2_numpy": lambda module, lines: module.parse_arrays(lines),
+    "p4.part1_stream": lambda module, lines: (io.StringIO("\n".join(lines)),),
+    "p4.part2_stream": lambda module, lines: (io.StringIO("\n".join(lines)),),
+    "p5.part1_numpy": lambda module, lines: module.parse_arrays(lines),
+    "p5.part2_numpy": lambda module, lines: module.parse_arrays(lines),
+    "p5.part1_sparse": lambda module, lines: module.parse_input(lines)[:1],
+    "p5.part2_sparse": lambda module, lines: module.parse_input(lines)[:1],
+    "p8.part1_masks": lambda module, lines: (module.parse_masks(lines),),
+    "p8.part2_masks": lambda module, lines: (module.parse_masks(lines),),
+    "p8.part1_stream": lambda module, lines: (io.StringIO("\n".join(lines)), 2),
+    "p8.part2_stream": lambda module, lines: (io.StringIO("\n".join(lines)), 2),
+}
+
+# largest generate.py size per day, the references are slow on big inputs
+MAX_SIZE: Dict[int, int] = {
+    4: 100,
+    5: 233,
+}
+
+SIZES: List[int] = [1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144, 233, 377, 610, 987]
+
+Mismatch = namedtuple(
+    'Mismatch', ['day', 'reference', 'candidate', 'size', 'seed', 'lines', 'expected', 'actual'])
+
+
+class Invalid(Exception):
+    # the reference rejects the input, it says nothing about the candidate
+    pass
+
+
+def same(a: Any, b: Any) -> bool:
+    # numpy arrays and scalars compare as plain python values
+    def plain(value):
+        return value.tolist() if hasattr(value, "tolist") else value
+    return plain(a) == plain(b)
+
+
+def call(module, name: str, day: int, lines: List[str]) -> Any:
+    # fresh arguments per call, some functions modify their input
+    with contextlib.redirect_stdout(io.StringIO()):
+        arguments = CANDIDATE_ARGUMENTS.get(f"{module.__name__}.{name}", ARGUMENTS[day])
+        return getattr(module, name)(*arguments(module, lines))
+
+
+def outcome(module, day: int, reference: str, candidate: str,
+            lines: List[str]) -> Optional[Tuple[Any, Any]]:
+    # None if both agree, otherwise (expected, actual)
+    try:
+        expected = call(module, reference, day, lines)
+    except Exception as error:
+        raise Invalid(error)
+    try:
+        actual = call(module, candidate, day, lines)
+    except Exception as error:
+        actual = f"{type(error).__name__}: {error}"
+    return None if same(expected, actual) else (expected, actual)
+
+
+def split_units(lines: List[str]) -> Tuple[List[str], Callable[[List[str]], List[str]]]:
+    # one line inputs (p6, p7) shrink by their comma separated items
+    if len(lines) == 1 and "," in lines[0]:
+        return lines[0].split(","), lambda units: [",".join(units)]
+    return lines, lambda units: units
+
+
+def shrink(module, day: int, reference: str, candidate: str, lines: List[str]) -> List[str]:
+    units, join = split_units(lines)
+
+    def fails(trial: List[str]) -> bool:
+        try:
+            return bool(trial) and outcome(module, day, reference, candidate, join(trial)) is not None
+        except Invalid:
+            return False
+
+    chunk = len(units) // 2
+    while chunk >= 1:
+        start = 0
+        while start < len(units):
+            trial = units[:start] + units[start + chunk:]
+            if fails(trial):
+                units = trial
+            else:
+                start += chunk
+        chunk //= 2
+    return join(units)
+
+
+def check(day: int, trials: int, seed: int) -> Tuple[int, List[Mismatch]]:
+    module = importlib.import_module(f"p{day}")
+    sizes = [size for size in SIZES if size <= MAX_SIZE.get(day, SIZES[-1])]
+    rng = random.Random(seed)
+    checked = 0
+    mismatches: List[Mismatch] = []
+    for reference, candidate in PAIRS[day]:
+        for trial in range(trials):
+            size = sizes[trial % len(sizes)]
+            trial_seed = rng.randrange(1 << 32)
+            lines = generate.lines(day, size, trial_seed)
+            try:
+                result = outcome(module, day, reference, candidate, lines)
+            except Invalid:
+                continue
+            checked += 1
+            if result is not None:
+                small = shrink(module, day, reference, candidate, lines)
+                expected, actual = outcome(module, day, reference, candidate, small)
+                mismatches.append(Mismatch(day, reference, candidate, size,
+                                           trial_seed, small, expected, actual))
+                # one shrunk counterexample per pair is enough to start debugging
+                break
+    return checked, mismatches
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="compare engines with their references")
+    parser.add_argument("days", nargs="*", type=int, help="days to check, all by default")
+    parser.add_argument("--trials", type=int, default=100, help="inputs per pair")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    failed = False
+    for day in args.days or sorted(PAIRS):
+        checked, mismatches = check(day, args.trials, args.seed)
+        print(f"p{day}: {checked} inputs checked, {len(mismatches)} mismatches")
+        for mismatch in mismatches:
+            failed = True
+            print(f"  {mismatch.candidate} != {mismatch.reference} "
+                  f"(size {mismatch.size}, seed {mismatch.seed}), shrunk input:")
+            for line in mismatch.lines:
+                print(f"    {line}")
+            print(f"  expected {mismatch.expected!r}, got {mismatch.actual!r}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
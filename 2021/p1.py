@@ -1,23 +1,28 @@
 #!/usr/bin/env python3
-from typing import List, Tuple
-
-from aocd import numbers  # like [int(n) for n in data.splitlines()]
-from aocd import submit
+from typing import Iterable, Iterator, List, TextIO, Tuple, Callable
+import inputs
+# from aocd import submit
 import functools
+import itertools
+import sys
+from collections import deque
+import numpy as np
+
+
+# quick solution, checked against the functional one by oracle.py
+def part1_quick(numbers: List[int]) -> int:
+    count: int = 0
+    for index, number in enumerate(numbers[:-1]):
+        if number < numbers[index+1]:
+            count += 1
+    return count
 
-# quick solution
-# def part1(numbers: List[int]) -> int:
-#     count: int = 0
-#     for index, number in enumerate(numbers[:-1]):
-#         if number < numbers[index+1]:
-#             count += 1
-#     return count
 
-# def part2(numbers: List[int]) -> int:
-#     sums: List[int] = []
-#     for index, number in enumerate(numbers[:-2]):
-#         sums.append(number + numbers[index+1] + numbers[index+2])
-#     return part1(sums)
+def part2_quick(numbers: List[int]) -> int:
+    sums: List[int] = []
+    for index, number in enumerate(numbers[:-2]):
+        sums.append(number + numbers[index+1] + numbers[index+2])
+    return part1_quick(sums)
 
 
 # functional solution
@@ -42,7 +47,66 @@ def part2(numbers: List[int]) -> int:
     return part1(functools.reduce(part2_reducer, numbers[2:], (numbers[1], numbers[0], []))[2])
 
 
+# streaming solution, constant memory for any window size
+def read_numbers(file: TextIO) -> Iterator[int]:
+    return (int(line) for line in file if line.strip())
+
+
+def count_increases(numbers: Iterable[int], window: int = 1) -> int:
+    # consecutive window sums share all but one reading, so a sum grows
+    # exactly when the reading entering the window beats the one leaving it
+    if window < 1:
+        raise ValueError(f"window must be at least 1, got {window}")
+    readings = iter(numbers)
+    leaving = deque(itertools.islice(readings, window), maxlen=window)
+    count: int = 0
+    for reading in readings:
+        if reading > leaving[0]:
+            count += 1
+        leaving.append(reading)
+    return count
+
+
+def part1_stream(numbers: Iterable[int]) -> int:
+    return count_increases(numbers, 1)
+
+
+def part2_stream(numbers: Iterable[int]) -> int:
+    return count_increases(numbers, 3)
+
+
+def count_file_increases(path: str, window: int = 1) -> int:
+    with open(path, buffering=1 << 20) as file:
+        return count_increases(read_numbers(file), window)
+
+
+# vectorized solution for large batches
+def parse_array(lines: List[str]) -> np.ndarray:
+    return np.array(lines, dtype=np.int64)
+
+
+def part1_numpy(numbers: np.ndarray) -> int:
+    return int(np.count_nonzero(np.diff(numbers) > 0))
+
+
+def part2_numpy(numbers: np.ndarray) -> int:
+    # the sums of windows three apart differ by the readings three apart
+    return int(np.count_nonzero(numbers[3:] > numbers[:-3]))
+
+
+# parsed input bound to both parts, used by run.py
+def parts(lines: List[str]) -> Tuple[Callable[[], int], Callable[[], int]]:
+    numbers = [int(line) for line in lines]
+    return (lambda: part1(numbers), lambda: part2(numbers))
+
+
+def count_command(argv: List[str]):
+    # p1.py <file> [window] counts the increases of a sensor log of any size
+    print(count_file_increases(argv[0], int(argv[1]) if len(argv) > 1 else 1))
+
+
 def main():
+    numbers = inputs.numbers(1)
 
     example: List[int] = [
         199,
@@ -59,6 +123,7 @@ def main():
 
     assert(part1(example) == 7)
     assert(part2(example) == 5)
+    assert(part2_stream(example) == 5)
     answer_a = part1(numbers)
     answer_b = part2(numbers)
 
@@ -73,4 +138,7 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    if sys.argv[1:]:
+        count_command(sys.argv[1:])
+    else:
+        main()
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
-from typing import List, Dict
-from aocd import lines, submit
+from typing import List, Dict, Tuple, Callable
+import inputs
+# from aocd import submit
 import functools
 
 bracket_error_score: Dict[str, int] = {")": 3, "]": 57, "}": 1197, ">": 25137}
@@ -57,7 +58,14 @@ def part2(lines: List[str]) -> int:
     return sorted(scores)[len(scores) // 2]
 
 
+# parsed input bound to both parts, used by run.py
+def parts(lines: List[str]) -> Tuple[Callable[[], int], Callable[[], int]]:
+    return (lambda: part1(lines), lambda: part2(lines))
+
+
 def main():
+    lines = inputs.lines(10)
+
     example: List[str] = [
         "[({(<(())[]>[[{[]{<()<>>",
         "[(()[<>])]({[<{<<[]>>(",
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
-from typing import List, Tuple
-from aocd import lines, submit
+from typing import List, Tuple, Callable
+import inputs
+# from aocd import submit
 import itertools
 from copy import deepcopy
 from operator import countOf
@@ -68,7 +69,15 @@ def part2(map: Map) -> int:
     return iterations
 
 
+# parsed input bound to both parts, used by run.py
+def parts(lines: List[str]) -> Tuple[Callable[[], int], Callable[[], int]]:
+    octopuses = parse(lines)
+    return (lambda: part1(octopuses, 100), lambda: part2(octopuses))
+
+
 def main():
+    lines = inputs.lines(11)
+
     example: List[str] = [
         "5483143223",
         "2745854711",
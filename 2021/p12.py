@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
-from typing import List, Dict, Tuple
-from aocd import lines, submit
+from typing import List, Dict, Tuple, Callable
+import inputs
+# from aocd import submit
 from copy import deepcopy
 
 Graph = Dict[str, List[str]]
@@ -59,7 +60,15 @@ def part2(graph: Graph) -> int:
     return len(paths)
 
 
+# parsed input bound to both parts, used by run.py
+def parts(lines: List[str]) -> Tuple[Callable[[], int], Callable[[], int]]:
+    cave = parse(lines)
+    return (lambda: part1(cave), lambda: part2(cave))
+
+
 def main():
+    lines = inputs.lines(12)
+
     example: List[str] = [
         "start-A",
         "start-b",
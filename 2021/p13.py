@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
-from typing import List, Tuple, TypeVar
-from aocd import lines, submit
+from typing import List, Tuple, TypeVar, Callable
+import inputs
+# from aocd import submit
 from operator import add
 from functools import reduce
 
@@ -77,7 +78,15 @@ def part2(paper: Map, folds: List[Fold]) -> Map:
         return paper
 
 
+# parsed input bound to both parts, used by run.py
+def parts(lines: List[str]) -> Tuple[Callable[[], int], Callable[[], Map]]:
+    paper, folds = parse(lines)
+    return (lambda: part1(paper, folds), lambda: part2(paper, folds))
+
+
 def main():
+    lines = inputs.lines(13)
+
     example: List[str] = [
         "6,10",
         "0,14",
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
-from typing import List, Tuple, Dict
-from aocd import lines, submit
+from typing import List, Tuple, Dict, Callable
+import inputs
+# from aocd import submit
 from copy import deepcopy
 from functools import reduce
 from collections import defaultdict
@@ -62,7 +63,16 @@ def solution(template: str, insertions: Insertions, iterations: int) -> int:
     return most_common - least_common
 
 
+# parsed input bound to both parts, used by run.py
+def parts(lines: List[str]) -> Tuple[Callable[[], int], Callable[[], int]]:
+    template, insertions = parse(lines)
+    return (lambda: solution(template, insertions, 10),
+            lambda: solution(template, insertions, 40))
+
+
 def main():
+    lines = inputs.lines(14)
+
     example: List[str] = [
         "NNCB",
         "",
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
-from typing import List, Tuple, Dict, Set
-from aocd import lines, submit
+from typing import List, Tuple, Dict, Set, Callable
+import inputs
+# from aocd import submit
 # from copy import deepcopy
 from functools import reduce
 from itertools import accumulate, chain
@@ -79,7 +80,15 @@ def part2(map: Map) -> int:
     return part1(map)
 
 
+# parsed input bound to both parts, used by run.py
+def parts(lines: List[str]) -> Tuple[Callable[[], int], Callable[[], int]]:
+    risk_map = parse(lines)
+    return (lambda: part1(risk_map), lambda: part2(risk_map))
+
+
 def main():
+    lines = inputs.lines(15)
+
     example: List[str] = [
         "1163751742",
         "1381373672",
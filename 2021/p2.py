@@ -1,10 +1,14 @@
 #!/usr/bin/env python3
-from typing import List, Tuple
+from typing import Iterable, Iterator, List, Optional, Tuple, Callable
+import inputs
+# from aocd import submit
 from enum import Enum
-from aocd import lines
-from aocd import submit
 import functools
 from collections import namedtuple
+import itertools
+import multiprocessing
+import os
+import numpy as np
 
 Command = namedtuple('Command', ['direction', 'amount'])
 State1 = namedtuple('State1', ['horizontal', 'depth'], defaults=[0, 0])
@@ -38,33 +42,72 @@ def parse(lines: List[str]) -> List[Command]:
     return parsed
 
 
-# quick solution
-# def part1(commands: List[Command]) -> int:
-#     horizontal: int = 0
-#     depth: int = 0
-#     for direction, amount in commands:
-#         if (direction == Direction.FORWARD):
-#             horizontal += amount
-#         elif direction == Direction.UP:
-#             depth -= amount
-#         elif direction == Direction.DOWN:
-#             depth += amount
-#     return horizontal * depth
-
-
-# def part2(commands: List[Command]) -> int:
-#     horizontal: int = 0
-#     depth: int = 0
-#     aim: int = 0
-#     for direction, amount in commands:
-#         if (direction == Direction.FORWARD):
-#             horizontal += amount
-#             depth += aim * amount
-#         elif direction == Direction.UP:
-#             aim -= amount
-#         elif direction == Direction.DOWN:
-#             aim += amount
-#     return horizontal * depth
+# quick solution, checked against the functional one by oracle.py
+def part1_quick(commands: List[Command]) -> int:
+    horizontal: int = 0
+    depth: int = 0
+    for direction, amount in commands:
+        if (direction == Direction.FORWARD):
+            horizontal += amount
+        elif direction == Direction.UP:
+            depth -= amount
+        elif direction == Direction.DOWN:
+            depth += amount
+    return horizontal * depth
+
+
+def part2_quick(commands: List[Command]) -> int:
+    horizontal: int = 0
+    depth: int = 0
+    aim: int = 0
+    for direction, amount in commands:
+        if (direction == Direction.FORWARD):
+            horizontal += amount
+            depth += aim * amount
+        elif direction == Direction.UP:
+            aim -= amount
+        elif direction == Direction.DOWN:
+            aim += amount
+    return horizontal * depth
+
+
+# vectorized solution, directions as int8 codes in the order of Direction
+FORWARD, UP, DOWN = 0, 1, 2
+
+
+DIRECTION_CODES = {"forward": FORWARD, "up": UP, "down": DOWN}
+
+
+def parse_arrays(lines: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    # a line without exactly two words would shift every pair after it
+    for line in lines:
+        if len(line.split()) != 2:
+            raise ValueError(f"malformed command {line!r}")
+    words = " ".join(lines).split()
+    unknown = set(words[0::2]) - DIRECTION_CODES.keys()
+    if unknown:
+        raise ValueError(f"unknown direction {min(unknown)!r}")
+    amounts = np.array(words[1::2], dtype=np.int64)
+    initials = np.frombuffer(
+        "".join(word[0] for word in words[0::2]).encode(), dtype=np.uint8)
+    directions = np.full(len(initials), FORWARD, dtype=np.int8)
+    directions[initials == ord("u")] = UP
+    directions[initials == ord("d")] = DOWN
+    return (directions, amounts)
+
+
+def part1_numpy(directions: np.ndarray, amounts: np.ndarray) -> int:
+    horizontal = amounts[directions == FORWARD].sum()
+    depth = amounts[directions == DOWN].sum() - amounts[directions == UP].sum()
+    # products of large sums leave int64
+    return int(horizontal) * int(depth)
+
+
+def part2_numpy(directions: np.ndarray, amounts: np.ndarray) -> int:
+    aim = np.cumsum(np.where(directions == DOWN, amounts,
+                             np.where(directions == UP, -amounts, 0)))
+    forward = np.where(directions == FORWARD, amounts, 0)
+    return int(forward.sum()) * int(np.dot(aim, forward))
 
 
 # functional solution
@@ -97,7 +140,103 @@ def part2(commands: List[Command]) -> int:
     return horizontal * depth
 
 
+# chunk parallel solution
+# every command is an affine update of State2, so a chunk of commands collapses into
+# one Transform and transforms compose associatively in any grouping:
+#   horizontal += forward, depth += aim * forward + dive, aim += turn
+# the depth of part 1 is the aim of part 2, so one transform answers both parts
+Transform = namedtuple('Transform', ['forward', 'dive', 'turn'], defaults=[0, 0, 0])
+
+
+def compose(first: Transform, second: Transform) -> Transform:
+    return Transform(first.forward + second.forward,
+                     first.dive + first.turn * second.forward + second.dive,
+                     first.turn + second.turn)
+
+
+def apply(transform: Transform, state: State2) -> State2:
+    return State2(state.horizontal + transform.forward,
+                  state.depth + state.aim * transform.forward + transform.dive,
+                  state.aim + transform.turn)
+
+
+def chunk_transform(lines: List[str]) -> Transform:
+    # plain loop, this runs once per command in the workers
+    forward = dive = turn = 0
+    for line in lines:
+        direction, amount = line.split()
+        if direction == "forward":
+            forward += int(amount)
+            dive += turn * int(amount)
+        elif direction == "up":
+            turn -= int(amount)
+        elif direction == "down":
+            turn += int(amount)
+        else:
+            raise ValueError(f"unknown direction {direction!r}")
+    return Transform(forward, dive, turn)
+
+
+def chunk_trajectory(start_and_lines: Tuple[State2, List[str]]) -> List[State2]:
+    state, lines = start_and_lines
+    return list(itertools.accumulate(parse(lines), part2_reducer, initial=state))[1:]
+
+
+def chunked(lines: Iterable[str], size: int) -> Iterator[List[str]]:
+    iterator = iter(lines)
+    return iter(lambda: list(itertools.islice(iterator, size)), [])
+
+
+def chunk_size(lines: List[str], processes: int) -> int:
+    # a few chunks per process keeps the workers busy until the end
+    return max(1, -(-len(lines) // (processes * 4)))
+
+
+def reduce_parallel(lines: Iterable[str], processes: Optional[int] = None,
+                    size: int = 1 << 16) -> Transform:
+    with multiprocessing.Pool(processes) as pool:
+        return functools.reduce(compose, pool.imap(chunk_transform, chunked(lines, size)), Transform())
+
+
+def part1_parallel(lines: List[str], processes: Optional[int] = None) -> int:
+    processes = processes or os.cpu_count()
+    total = reduce_parallel(lines, processes, chunk_size(lines, processes))
+    return total.forward * total.turn
+
+
+def part2_parallel(lines: List[str], processes: Optional[int] = None) -> int:
+    processes = processes or os.cpu_count()
+    total = reduce_parallel(lines, processes, chunk_size(lines, processes))
+    return total.forward * total.dive
+
+
+def part2_states(commands: List[Command]) -> List[State2]:
+    # sequential reference of trajectory, the state after every command
+    return list(itertools.accumulate(commands, part2_reducer, initial=State2()))[1:]
+
+
+def trajectory(lines: List[str], processes: Optional[int] = None) -> List[State2]:
+    # parallel prefix scan: reduce every chunk, scan the few chunk transforms
+    # sequentially, then expand every chunk from its own start state
+    processes = processes or os.cpu_count()
+    chunks = list(chunked(lines, chunk_size(lines, processes)))
+    with multiprocessing.Pool(processes) as pool:
+        transforms = pool.map(chunk_transform, chunks)
+        starts = itertools.accumulate(transforms[:-1], lambda state, transform: apply(transform, state),
+                                      initial=State2())
+        states = pool.map(chunk_trajectory, zip(starts, chunks))
+    return list(itertools.chain.from_iterable(states))
+
+
+# parsed input bound to both parts, used by run.py
+def parts(lines: List[str]) -> Tuple[Callable[[], int], Callable[[], int]]:
+    commands = parse(lines)
+    return (lambda: part1(commands), lambda: part2(commands))
+
+
 def main():
+    lines = inputs.lines(2)
+
     example: List[str] = [
         "forward 5",
         "down 5",
@@ -1,8 +1,10 @@
 #!/usr/bin/env python3
-from typing import List
-from aocd import lines
-from aocd import submit
+from typing import List, Optional, Tuple, Callable
+import inputs
+# from aocd import submit
 import functools
+from bisect import bisect_left
+import numpy as np
 
 
 def parse(lines: List[str]) -> List[List[int]]:
@@ -46,7 +48,125 @@ def part2(matrix: List[List[int]]) -> int:
     return oxygen * co2
 
 
+# bit packed solution, every report is one integer
+def parse_packed(lines: List[str]) -> Tuple[List[int], int]:
+    return ([int(line, 2) for line in lines], len(lines[0]))
+
+
+def column_ones(numbers: List[int], width: int) -> List[int]:
+    # ones per column, most significant column first
+    if width <= 64:
+        packed = np.array(numbers, dtype=np.uint64)
+        return [int(np.count_nonzero(packed & np.uint64(1 << (width - 1 - column))))
+                for column in range(width)]
+    return [sum((number >> (width - 1 - column)) & 1 for number in numbers)
+            for column in range(width)]
+
+
+def part1_packed(numbers: List[int], width: int) -> int:
+    gamma = bitlist_to_int(
+        [ones >= (len(numbers) + 1) // 2 for ones in column_ones(numbers, width)])
+    epsilon = gamma ^ ((1 << width) - 1)
+    return gamma * epsilon
+
+
+def rating(ordered: List[int], width: int, invert: bool) -> int:
+    # the candidates sharing the bits chosen so far are the sorted range [low, high),
+    # the ones with the next bit set are its upper part, found by bisection
+    low, high, prefix = 0, len(ordered), 0
+    for bit in reversed(range(width)):
+        if high - low == 1:
+            break
+        split = bisect_left(ordered, prefix | (1 << bit), low, high)
+        majority = high - split >= (high - low + 1) // 2
+        if majority != invert:
+            low, prefix = split, prefix | (1 << bit)
+        else:
+            high = split
+        if low == high:
+            raise ValueError(f"no report left at bit {bit}")
+    return ordered[low]
+
+
+def part2_packed(numbers: List[int], width: int) -> int:
+    ordered = sorted(numbers)
+    return rating(ordered, width, invert=False) * rating(ordered, width, invert=True)
+
+
+# count annotated binary trie for repeated rating queries
+# a rule picks the bit to follow from the (zeros, ones) counts below a node
+Rule = Callable[[int, int], int]
+
+
+def oxygen_rule(zeros: int, ones: int) -> int:
+    return int(ones >= zeros)
+
+
+def co2_rule(zeros: int, ones: int) -> int:
+    return int(ones < zeros)
+
+
+class BitTrie:
+    # nodes live in flat lists, children[2 * node + bit] is 0 for a missing child
+    def __init__(self, width: int, order: Optional[List[int]] = None):
+        self.width = width
+        # the columns in the order they are decided, a permutation of range(width)
+        self.order = order if order is not None else list(range(width))
+        assert sorted(self.order) == list(range(width))
+        self.counts: List[int] = [0]
+        self.children: List[int] = [0, 0]
+
+    def insert(self, row: List[int]):
+        node = 0
+        self.counts[0] += 1
+        for column in self.order:
+            slot = 2 * node + row[column]
+            if not self.children[slot]:
+                self.children[slot] = len(self.counts)
+                self.counts.append(0)
+                self.children += [0, 0]
+            node = self.children[slot]
+            self.counts[node] += 1
+
+    def query(self, rule: Rule) -> int:
+        # O(width) whatever the number of reports
+        bits: List[int] = [0] * self.width
+        node = 0
+        for column in self.order:
+            zero, one = self.children[2 * node], self.children[2 * node + 1]
+            if self.counts[node] == 1:
+                # a single report left, follow it to its leaf
+                bit = int(not zero)
+            else:
+                bit = rule(self.counts[zero] if zero else 0, self.counts[one] if one else 0)
+            node = self.children[2 * node + bit]
+            if not node:
+                raise ValueError(f"no report left at column {column}")
+            bits[column] = bit
+        return bitlist_to_int(bits)
+
+
+def build_trie(matrix: List[List[int]], order: Optional[List[int]] = None) -> BitTrie:
+    trie = BitTrie(len(matrix[0]), order)
+    for row in matrix:
+        trie.insert(row)
+    return trie
+
+
+def part2_trie(matrix: List[List[int]]) -> int:
+    trie = build_trie(matrix)
+    return trie.query(oxygen_rule) * trie.query(co2_rule)
+
+
+# parsed input bound to both parts, used by run.py
+def parts(lines: List[str]) -> Tuple[Callable[[], int], Callable[[], int]]:
+    matrix = parse(lines)
+    return (lambda: part1(matrix), lambda: part2(matrix))
+
+
 def main():
+    lines = inputs.lines(3)
+
     example: List[str] = [
         "00100",
         "11110",
@@ -1,10 +1,13 @@
 #!/usr/bin/env python3
-from typing import List, Tuple, Set
-from aocd import lines
-from aocd import submit
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple, Set, Callable
+import inputs
+# from aocd import submit
 import functools
 import re
 from itertools import chain
+from collections import defaultdict, namedtuple
+from array import array
+import numpy as np
 
 Board = List[List[int]]
 
@@ -87,7 +90,174 @@ def part2(boards: List[Board], drawn: List[int]) -> int:
     return -1
 
 
+# indexed solution, every mark and win check is O(1)
+Position = Tuple[int, int, int]
+
+
+def index_boards(boards: List[Board]) -> Dict[int, List[Position]]:
+    # number -> (board, row, column) of every cell holding it, in occurences order
+    index: Dict[int, List[Position]] = defaultdict(list)
+    for board, rows in enumerate(boards):
+        for row, numbers in enumerate(rows):
+            for column, number in enumerate(numbers):
+                index[number].append((board, row, column))
+    return index
+
+
+Indexed = namedtuple('Indexed', ['boards', 'drawn', 'index'])
+
+
+def parse_indexed(lines: List[str]) -> Indexed:
+    # the index is built once here and only read afterwards
+    drawn, boards = parse(lines)
+    return Indexed(boards, drawn, dict(index_boards(boards)))
+
+
+def wins(indexed: Indexed) -> Iterator[Tuple[int, int]]:
+    # (board, score) in the order the boards win, finished boards are not touched again
+    boards, drawn, index = indexed
+    height, width = len(boards[0]), len(boards[0][0])
+    row_hits: List[List[int]] = [[0] * height for _ in boards]
+    column_hits: List[List[int]] = [[0] * width for _ in boards]
+    unmarked: List[int] = [sum(map(sum, board)) for board in boards]
+    finished: List[bool] = [False] * len(boards)
+    called: Set[int] = set()
+    for number in drawn:
+        # marking a cell twice changes nothing, so a repeated draw is skipped
+        if number in called:
+            continue
+        called.add(number)
+        for board, row, column in index.get(number, ()):
+            if finished[board]:
+                continue
+            row_hits[board][row] += 1
+            column_hits[board][column] += 1
+            unmarked[board] -= number
+            if row_hits[board][row] == width or column_hits[board][column] == height:
+                finished[board] = True
+                yield (board, unmarked[board] * number)
+
+
+def part1_indexed(indexed: Indexed) -> int:
+    return next((score for _, score in wins(indexed)), -1)
+
+
+def part2_indexed(indexed: Indexed) -> int:
+    for count, (_, score) in enumerate(wins(indexed), start=1):
+        if count == len(indexed.boards):
+            return score
+    return -1
+
+
+# closed form solution: a board wins at the lowest, over its rows and columns,
+# of the highest draw rank in that line, so all boards are solved in one pass
+def parse_arrays(lines: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    # (boards, rows, columns) stack and the draws, in the argument order of the parts
+    drawn, boards = parse(lines)
+    return (np.array(boards, dtype=np.int64), np.array(drawn, dtype=np.int64))
+
+
+def win_turns(boards: np.ndarray, drawn: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # turn and score of every board, boards that never win get turn len(drawn)
+    never = len(drawn)
+    numbers, first = np.unique(drawn, return_index=True)
+    rank = np.full(max(int(boards.max()), int(drawn.max(initial=0))) + 1, never, dtype=np.int64)
+    rank[numbers] = first
+    ranks = rank[boards]
+    turns = np.minimum(ranks.max(axis=2).min(axis=1), ranks.max(axis=1).min(axis=1))
+    unmarked = np.where(ranks > turns[:, None, None], boards, 0).sum(axis=(1, 2))
+    return (turns, unmarked * np.append(drawn, 0)[turns])
+
+
+def part1_numpy(boards: np.ndarray, drawn: np.ndarray) -> int:
+    turns, scores = win_turns(boards, drawn)
+    # argmin picks the lowest board index, the first to be marked on that draw
+    first = int(np.argmin(turns))
+    return int(scores[first]) if turns[first] < len(drawn) else -1
+
+
+def part2_numpy(boards: np.ndarray, drawn: np.ndarray) -> int:
+    turns, scores = win_turns(boards, drawn)
+    if (turns == len(drawn)).any():
+        return -1
+    # of the boards winning on the last draw the highest index is marked last
+    last = len(turns) - 1 - int(np.argmax(turns[::-1]))
+    return int(scores[last])
+
+
+# streaming solution, one compact board in memory at a time
+FlatBoard = namedtuple('FlatBoard', ['width', 'cells'])
+
+
+def read_boards(file: TextIO) -> Tuple[List[int], Iterator[FlatBoard]]:
+    drawn: List[int] = [int(number) for number in file.readline().split(",")]
+
+    def boards() -> Iterator[FlatBoard]:
+        cells: array = array("q")
+        width: int = 0
+        for line in file:
+            row = line.split()
+            if row:
+                width = len(row)
+                cells.extend(map(int, row))
+            elif cells:
+                yield FlatBoard(width, cells)
+                cells = array("q")
+        if cells:
+            yield FlatBoard(width, cells)
+    return (drawn, boards())
+
+
+def flat_win_turn(board: FlatBoard, rank: Dict[int, int], never: int) -> int:
+    ranks = [rank.get(cell, never) for cell in board.cells]
+    rows = [max(ranks[start:start + board.width]) for start in range(0, len(ranks), board.width)]
+    columns = [max(ranks[column::board.width]) for column in range(board.width)]
+    return min(min(rows), min(columns))
+
+
+def flat_score(board: FlatBoard, rank: Dict[int, int], drawn: List[int], turn: int) -> int:
+    return sum(cell for cell in board.cells if rank.get(cell, len(drawn)) > turn) * drawn[turn]
+
+
+def stream_scores(file: TextIO) -> Tuple[int, int]:
+    # scores of the first and the last winning board, -1 like the other solutions
+    # if no board wins or some board never wins
+    drawn, boards = read_boards(file)
+    never = len(drawn)
+    rank: Dict[int, int] = {}
+    for turn, number in enumerate(drawn):
+        rank.setdefault(number, turn)
+    best: Optional[Tuple[int, FlatBoard]] = None
+    worst: Optional[Tuple[int, FlatBoard]] = None
+    for board in boards:
+        turn = flat_win_turn(board, rank, never)
+        # ties go to the board marked first for the first win and last for the last win
+        if best is None or turn < best[0]:
+            best = (turn, board)
+        if worst is None or turn >= worst[0]:
+            worst = (turn, board)
+    first = flat_score(best[1], rank, drawn, best[0]) if best and best[0] < never else -1
+    last = flat_score(worst[1], rank, drawn, worst[0]) if worst and worst[0] < never else -1
+    return (first, last)
+
+
+def part1_stream(file: TextIO) -> int:
+    return stream_scores(file)[0]
+
+
+def part2_stream(file: TextIO) -> int:
+    return stream_scores(file)[1]
+
+
+# parsed input bound to both parts, used by run.py
+def parts(lines: List[str]) -> Tuple[Callable[[], int], Callable[[], int]]:
+    drawn, boards = parse(lines)
+    return (lambda: part1(boards, drawn), lambda: part2(boards, drawn))
+
+
 def main():
+    lines = inputs.lines(4)
+
     example: List[str] = [
         "7, 4, 9, 5, 11, 17, 23, 2, 0, 14, 21, 24, 10, 16, 13, 6, 15, 25, 12, 22, 18, 20, 8, 19, 3, 26, 1",
         "",
@@ -1,8 +1,9 @@
 #!/usr/bin/env python3
-from typing import Iterable, List, Tuple, Set
-from aocd import lines
-from aocd import submit
+from typing import Iterable, List, Optional, Tuple, Set, Callable
+import inputs
+# from aocd import submit
 from operator import add
+import functools
 
 
 def parse(lines: List[str]) -> List[int]:
@@ -24,11 +25,98 @@ def solution(input: List[int], days: int) -> int:
     return sum(fishes)
 
 
+# matrix power solution, O(log days) products of 9x9 matrices
+Matrix = List[List[int]]
+
+
+def transition_matrix(reset: int = 6, spawn: int = 8) -> Matrix:
+    # fishes[timer] of the next day is the row timer times the fishes of today
+    size = spawn + 1
+    matrix: Matrix = [[0] * size for _ in range(size)]
+    for timer in range(spawn):
+        matrix[timer][timer + 1] = 1
+    matrix[spawn][0] = 1
+    matrix[reset][0] += 1
+    return matrix
+
+
+def multiply(a: Matrix, b: Matrix, modulus: Optional[int] = None) -> Matrix:
+    columns = list(zip(*b))
+    product = [[sum(x * y for x, y in zip(row, column)) for column in columns] for row in a]
+    return [[value % modulus for value in row] for row in product] if modulus else product
+
+
+def matrix_power(matrix: Matrix, exponent: int, modulus: Optional[int] = None) -> Matrix:
+    if exponent < 0:
+        raise ValueError(f"exponent must not be negative, got {exponent}")
+    result: Matrix = [[int(row == column) for column in range(len(matrix))]
+                      for row in range(len(matrix))]
+    while exponent:
+        if exponent & 1:
+            result = multiply(result, matrix, modulus)
+        matrix = multiply(matrix, matrix, modulus)
+        exponent >>= 1
+    return result
+
+
+def solution_matrix(input: List[int], days: int, modulus: Optional[int] = None) -> int:
+    # exact python ints grow by about 0.04 digits a day, pass a modulus for huge day counts
+    if days < 0:
+        raise ValueError(f"days must not be negative, got {days}")
+    power = matrix_power(transition_matrix(), days, modulus)
+    fishes: List[int] = [input.count(i) for i in range(9)]
+    total = sum(sum(row[timer] for row in power) * count for timer, count in enumerate(fishes))
+    return total % modulus if modulus else total
+
+
+# batch forecasts, one growth table per horizon shared by every school
+@functools.lru_cache(maxsize=64)
+def growth_table(days: int, reset: int = 6, spawn: int = 8,
+                 modulus: Optional[int] = None) -> Tuple[int, ...]:
+    # fishes after days descending from a single fish with each timer value
+    power = matrix_power(transition_matrix(reset, spawn), days, modulus)
+    table = [sum(row[timer] for row in power) for timer in range(spawn + 1)]
+    return tuple(value % modulus for value in table) if modulus else tuple(table)
+
+
+def forecast(populations: Iterable[List[int]], horizons: Iterable[int], reset: int = 6,
+             spawn: int = 8, modulus: Optional[int] = None) -> List[List[int]]:
+    # result[school][horizon], every answer is a dot product with a cached table
+    horizons = list(horizons)
+    # a bad horizon fails the batch before any table is built
+    for days in horizons:
+        if days < 0:
+            raise ValueError(f"days must not be negative, got {days}")
+    results: List[List[int]] = []
+    for population in populations:
+        fishes: List[int] = [population.count(i) for i in range(spawn + 1)]
+        if sum(fishes) != len(population):
+            raise ValueError(f"timers must be within 0..{spawn}")
+        answers: List[int] = []
+        for days in horizons:
+            total = sum(count * descendants for count, descendants
+                        in zip(fishes, growth_table(days, reset, spawn, modulus)))
+            answers.append(total % modulus if modulus else total)
+        results.append(answers)
+    return results
+
+
+# parsed input bound to both parts, used by run.py
+def parts(lines: List[str]) -> Tuple[Callable[[], int], Callable[[], int]]:
+    fishes = parse(lines)
+    return (lambda: solution(fishes, 80), lambda: solution(fishes, 256))
+
+
 def main():
+    lines = inputs.lines(6)
+
     example: List[str] = ["3, 4, 3, 1, 2"]
 
     example_fishes = parse(example)
     assert(solution(example_fishes, 80) == 5934)
+    assert(forecast([example_fishes], [18, 80, 256]) == [[26, 5934, 26984457539]])
+    # a fish resetting to 1 and spawning at 2, counted by hand
+    assert(forecast([[0]], range(6), reset=1, spawn=2) == [[1, 2, 2, 3, 4, 5]])
 
     fishes = parse(lines)
     answer_a = solution(fishes, 80)
@@ -1,7 +1,12 @@
 #!/usr/bin/env python3
-from typing import List
-from aocd import lines, submit
+from typing import List, Tuple, Callable
+import inputs
+# from aocd import submit
 import functools
+import math
+import random
+from collections import namedtuple
+import numpy as np
 
 
 def parse(lines: List[str]) -> List[int]:
@@ -32,7 +37,94 @@ def part2(crabs: List[int]) -> int:
     return min(costs)
 
 
+# sublinear search, the l1 cost is minimal at a median and the triangular cost is convex
+def quickselect(values: List[int], k: int) -> int:
+    # k-th smallest value, expected O(n)
+    while True:
+        pivot = random.choice(values)
+        lower = [value for value in values if value < pivot]
+        if k < len(lower):
+            values = lower
+            continue
+        equal = sum(1 for value in values if value == pivot)
+        if k < len(lower) + equal:
+            return pivot
+        k -= len(lower) + equal
+        values = [value for value in values if value > pivot]
+
+
+def part1_median(crabs: List[int]) -> int:
+    median = quickselect(crabs, (len(crabs) - 1) // 2)
+    return sum(dist(crab, median) for crab in crabs)
+
+
+def part2_mean(crabs: List[int]) -> int:
+    # the real minimum lies within half a step of the mean
+    mean = sum(crabs) // len(crabs)
+    candidates = range(max(mean - 1, 0), min(mean + 2, max(crabs)) + 1)
+    return min(sum(gaussian_sum(dist(crab, position)) for crab in crabs) for position in candidates)
+
+
+# whole cost curve from a position histogram, for any fuel polynomial in the distance
+# fuel(d) = sum(coefficients[k] * d ** k) / divisor, which must be integral for every d
+Fuel = namedtuple('Fuel', ['coefficients', 'divisor'])
+
+LINEAR = Fuel((0, 1), 1)
+TRIANGULAR = Fuel((0, 1, 1), 2)
+
+
+def check_fuel(fuel: Fuel):
+    # the sum is divided once, so every single crab must burn whole units. a polynomial
+    # is integral at every integer once it is at 0..degree
+    for d in range(len(fuel.coefficients)):
+        if sum(coefficient * d ** k for k, coefficient in enumerate(fuel.coefficients)) % fuel.divisor:
+            raise ValueError(f"{fuel} is not integral at distance {d}")
+
+
+def cost_curve(crabs: List[int], fuel: Fuel = LINEAR) -> np.ndarray:
+    # cost of every position 0..max(crabs) in O(n + max * degree^2). int64 wraps around,
+    # which is harmless as long as divisor * cost fits
+    check_fuel(fuel)
+    histogram = np.bincount(np.asarray(crabs, dtype=np.int64)).astype(np.int64)
+    positions = np.arange(len(histogram), dtype=np.int64)
+    # left[i][p] sums crab ** i over crabs at or before p, right[i][p] over the crabs after p
+    left: List[np.ndarray] = []
+    right: List[np.ndarray] = []
+    weighted = histogram
+    for _ in fuel.coefficients:
+        left.append(np.cumsum(weighted))
+        right.append(left[-1][-1] - left[-1])
+        weighted = weighted * positions
+    numerator = np.zeros(len(histogram), dtype=np.int64)
+    for k, coefficient in enumerate(fuel.coefficients):
+        if not coefficient:
+            continue
+        # (p - c) ** k on the left and (c - p) ** k on the right, expanded binomially
+        term = np.zeros(len(histogram), dtype=np.int64)
+        for i in range(k + 1):
+            term += math.comb(k, i) * positions ** (k - i) * \
+                ((-1) ** i * left[i] + (-1) ** (k - i) * right[i])
+        numerator += coefficient * term
+    return numerator // fuel.divisor
+
+
+def part1_curve(crabs: List[int]) -> int:
+    return int(cost_curve(crabs, LINEAR).min())
+
+
+def part2_curve(crabs: List[int]) -> int:
+    return int(cost_curve(crabs, TRIANGULAR).min())
+
+
+# parsed input bound to both parts, used by run.py
+def parts(lines: List[str]) -> Tuple[Callable[[], int], Callable[[], int]]:
+    crabs = parse(lines)
+    return (lambda: part1(crabs), lambda: part2(crabs))
+
+
 def main():
+    lines = inputs.lines(7)
+
     example: List[str] = ["16,1,2,0,4,2,7,1,2,14"]
 
     example_crabs = parse(example)
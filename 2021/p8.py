@@ -1,8 +1,13 @@
 #!/usr/bin/env python3
-from typing import List, Dict
-from aocd import lines, submit
+from typing import Deque, Iterable, Iterator, List, Dict, Optional, TextIO, Tuple, Callable
+import inputs
+# from aocd import submit
 import functools
-from collections import namedtuple
+import itertools
+import multiprocessing
+import os
+from collections import namedtuple, deque, OrderedDict
+from multiprocessing.pool import AsyncResult
 
 Display = namedtuple('Display', ['patterns', 'outputs'])
 
@@ -93,7 +98,151 @@ def part2(displays: List[Display]) -> int:
     return sum(map(decode, displays))
 
 
+# bitmask solution, segment a is bit 0. a pattern is identified by its size and its
+# overlaps with 1 and 4, which survive any rewiring
+DIGITS: List[str] = ["abcefg", "cf", "acdeg", "acdfg", "bcdf",
+                     "abdfg", "abdefg", "acf", "abcdefg", "abcdfg"]
+
+POPCOUNT: List[int] = [bin(mask).count("1") for mask in range(128)]
+
+BITS: Dict[str, int] = {segment: 1 << bit for bit, segment in enumerate("abcdefg")}
+
+
+# there are only 13699 orderings of segment subsets, so remember them all
+@functools.lru_cache(maxsize=None)
+def mask(pattern: str) -> int:
+    # segments do not repeat within a pattern, so adding is or-ing
+    return sum(map(BITS.__getitem__, pattern))
+
+
+def signature(pattern: int, one: int, four: int) -> Tuple[int, int, int]:
+    return (POPCOUNT[pattern], POPCOUNT[pattern & one], POPCOUNT[pattern & four])
+
+
+SIGNATURES: Dict[Tuple[int, int, int], int] = {
+    signature(mask(pattern), mask(DIGITS[1]), mask(DIGITS[4])): digit
+    for digit, pattern in enumerate(DIGITS)}
+assert(len(SIGNATURES) == len(DIGITS))
+
+
+def parse_masks(lines: List[str]) -> List[Display]:
+    displays: List[Display] = []
+    for line in lines:
+        patterns, outputs = line.split("|")
+        displays.append(Display(list(map(mask, patterns.split())), list(map(mask, outputs.split()))))
+    return displays
+
+
+def decode_masks(display: Display) -> int:
+    one = next(pattern for pattern in display.patterns if POPCOUNT[pattern] == 2)
+    four = next(pattern for pattern in display.patterns if POPCOUNT[pattern] == 4)
+    number: int = 0
+    for output in display.outputs:
+        number = number * 10 + SIGNATURES[signature(output, one, four)]
+    return number
+
+
+def part1_masks(displays: List[Display]) -> int:
+    return sum(1 for display in displays for output in display.outputs
+               if POPCOUNT[output] in (2, 3, 4, 7))
+
+
+def part2_masks(displays: List[Display]) -> int:
+    return sum(map(decode_masks, displays))
+
+
+# displays sharing a wiring share their solved mapping, keyed by the sorted patterns
+class MappingCache:
+    def __init__(self, capacity: int = 1 << 12,
+                 solve: Optional[Callable[[Display], Dict[str, int]]] = None):
+        self.capacity = capacity
+        self.solve = solve or map_output
+        self.mappings: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def mapping(self, display: Display) -> Dict[str, int]:
+        key = frozenset(list_to_str(sorted(pattern)) for pattern in display.patterns)
+        mapping = self.mappings.get(key)
+        if mapping is not None:
+            self.hits += 1
+            self.mappings.move_to_end(key)
+            return mapping
+        self.misses += 1
+        mapping = self.solve(display)
+        self.mappings[key] = mapping
+        if len(self.mappings) > self.capacity:
+            self.mappings.popitem(last=False)
+            self.evictions += 1
+        return mapping
+
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def decode_cached(display: Display, cache: MappingCache) -> int:
+    signal_map = cache.mapping(display)
+    number: int = 0
+    for output in display.outputs:
+        number = number * 10 + signal_map[list_to_str(sorted(output))]
+    return number
+
+
+def part2_cached(displays: List[Display], cache: Optional[MappingCache] = None) -> int:
+    cache = cache or MappingCache()
+    return sum(decode_cached(display, cache) for display in displays)
+
+
+# streaming solution, chunks of lines are decoded in a process pool and only a bounded
+# number of chunks is in flight at any time
+def chunked(lines: Iterable[str], size: int) -> Iterator[List[str]]:
+    # same as p2.chunked, a day never imports another day
+    iterator = iter(lines)
+    return iter(lambda: list(itertools.islice(iterator, size)), [])
+
+
+def decode_chunk(lines: List[str]) -> Tuple[int, int]:
+    displays = parse_masks(lines)
+    return (part1_masks(displays), part2_masks(displays))
+
+
+def decode_stream(file: TextIO, processes: Optional[int] = None,
+                  size: int = 1 << 14) -> Tuple[int, int]:
+    # (part1, part2) in a single pass over the file
+    processes = processes or os.cpu_count()
+    counted, total = 0, 0
+    pending: Deque[AsyncResult] = deque()
+    with multiprocessing.Pool(processes) as pool:
+        for chunk in chunked((line for line in file if line.strip()), size):
+            if len(pending) >= 2 * processes:
+                chunk_counted, chunk_total = pending.popleft().get()
+                counted, total = counted + chunk_counted, total + chunk_total
+            pending.append(pool.apply_async(decode_chunk, (chunk,)))
+        for result in pending:
+            chunk_counted, chunk_total = result.get()
+            counted, total = counted + chunk_counted, total + chunk_total
+    return (counted, total)
+
+
+def part1_stream(file: TextIO, processes: Optional[int] = None) -> int:
+    return decode_stream(file, processes)[0]
+
+
+def part2_stream(file: TextIO, processes: Optional[int] = None) -> int:
+    return decode_stream(file, processes)[1]
+
+
+# parsed input bound to both parts, used by run.py
+def parts(lines: List[str]) -> Tuple[Callable[[], int], Callable[[], int]]:
+    displays = parse(lines)
+    return (lambda: part1(displays), lambda: part2(displays))
+
+
 def main():
+    lines = inputs.lines(8)
+
     example: List[str] = [
         "be cfbegad cbdgef fgaecd cgeb fdcge agebfd fecdb fabcd edb | fdgacbe cefdb cefbgd gcbe",
         "edbfga begcd cbg gc gcadebf fbgde acbgfd abcde gfcbed gfec | fcgedb cgb dgebacf gc",
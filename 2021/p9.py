@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
-from typing import List, Tuple, Dict
-from aocd import lines, submit
+from typing import List, Tuple, Dict, Callable
+import inputs
+# from aocd import submit
 import functools
 import itertools
 from operator import add
@@ -96,7 +97,15 @@ def part2(map: Map) -> int:
     return functools.reduce(lambda x, y: x * y, highest_three, 1)
 
 
+# parsed input bound to both parts, used by run.py
+def parts(lines: List[str]) -> Tuple[Callable[[], int], Callable[[], int]]:
+    height_map = parse(lines)
+    return (lambda: part1(height_map), lambda: part2(height_map))
+
+
 def main():
+    lines = inputs.lines(9)
+
     example: List[str] = [
         "2199943210",
         "3987894921",
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# runs all days (or a selection) in a process pool and reports per part timings
+#
+#   python 2021/run.py              all days, one worker per cpu
+#   python 2021/run.py 9 12 15 -j1  selected days, one after another
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from collections import namedtuple
+from pathlib import Path
+import argparse
+import contextlib
+import importlib
+import io
+import multiprocessing
+import os
+import re
+import resource
+import sys
+import time
+
+import inputs
+import instrument
+import memory
+
+Timing = namedtuple(
+    'Timing', ['day', 'part', 'answer', 'wall', 'cpu', 'rss', 'usage'])
+# limit is the address space budget in bytes, trace enables tracemalloc accounting
+Task = namedtuple('Task', ['day', 'part', 'limit', 'trace'])
+
+PART_NAMES: List[str] = ["a", "b"]
+
+
+def discover() -> List[int]:
+    folder = Path(__file__).resolve().parent
+    days = [int(match.group(1)) for match in
+            map(lambda file: re.fullmatch(r"p(\d+)\.py", file.name), folder.iterdir()) if match]
+    return sorted(days)
+
+
+def peak_rss() -> int:
+    # ru_maxrss is KiB on linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def format_answer(answer: Any) -> str:
+    text = str(answer).replace("\n", " ")
+    return text if len(text) <= 16 else text[:13] + "..."
+
+
+def run_part(task: Task) -> Timing:
+    day, part, budget, trace = task
+    usage = None
+    # several days print their intermediate results, keep the report readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            module = importlib.import_module(f"p{day}")
+            if instrument.enabled():
+                instrument.install(module)
+            function = module.parts(inputs.lines(day))[part]
+            wall, cpu = time.perf_counter(), time.process_time()
+            if trace:
+                answer, usage = memory.measure(function, budget=budget)
+            else:
+                with memory.ceiling(budget):
+                    answer = function()
+            answer = format_answer(answer)
+        except MemoryError:
+            answer = f"over {budget >> 20} MiB" if budget else "MemoryError"
+        except Exception as error:
+            answer = format_answer(f"{type(error).__name__}: {error}")
+        wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    if instrument.enabled():
+        instrument.dump(f"p{day}{PART_NAMES[part]}")
+    return Timing(day, PART_NAMES[part], answer, wall, cpu, peak_rss(), usage)
+
+
+def init_worker(input_root: Optional[str], profile: Optional[str]):
+    if input_root:
+        os.environ["AOC_INPUTS"] = input_root
+    if profile:
+        os.environ[instrument.ENVIRONMENT] = profile
+
+
+def run(days: Iterable[int], jobs: int, input_root: Optional[str] = None,
+        profile: Optional[str] = None, trace: bool = False,
+        limits: Tuple[Optional[int], Dict[int, int]] = (None, {})) -> List[Timing]:
+    default_limit, day_limits = limits
+    tasks: List[Task] = [Task(day, part, day_limits.get(day, default_limit), trace)
+                         for day in days for part in range(2)]
+    # one fresh process per part, so peak rss is not inherited from other parts
+    with multiprocessing.Pool(jobs, init_worker, (input_root, profile), maxtasksperchild=1) as pool:
+        timings = list(pool.imap_unordered(run_part, tasks))
+    return sorted(timings, key=lambda timing: (timing.day, timing.part))
+
+
+def report(timings: List[Timing], wall: float):
+    print(f"{'day':>3} {'part':>4} {'answer':>16} {'wall ms':>10} {'cpu ms':>10} {'peak MiB':>9}")
+    for timing in timings:
+        print(f"{timing.day:>3} {timing.part:>4} {timing.answer:>16} "
+              f"{timing.wall * 1000:>10.1f} {timing.cpu * 1000:>10.1f} {timing.rss / (1 << 20):>9.1f}")
+    slowest = max(timings, key=lambda timing: timing.wall)
+    traced = [timing for timing in timings if timing.usage]
+    if traced:
+        print()
+        print(f"{'day':>3} {'part':>4} {'traced MiB':>11} {'retained MiB':>13}  top allocation sites")
+    for timing in traced:
+        peak, retained, sites = timing.usage
+        print(f"{timing.day:>3} {timing.part:>4} {peak / (1 << 20):>11.2f} {retained / (1 << 20):>13.2f}")
+        for site, size in sites:
+            print(f"{'':>34}{size / (1 << 20):>8.2f} MiB {site}")
+    print(f"total {wall * 1000:.1f} ms wall, "
+          f"{sum(timing.cpu for timing in timings) * 1000:.1f} ms cpu, "
+          f"slowest p{slowest.day}{slowest.part} {slowest.wall * 1000:.1f} ms")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="run advent of code days")
+    parser.add_argument("days", nargs="*", type=int,
+                        help="days to run, all by default")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(),
+                        help="worker processes, 1 runs the days sequentially")
+    parser.add_argument("--inputs", help="input store root, see inputs.py")
+    parser.add_argument("--profile", metavar="DIR",
+                        help="profile every part into DIR, see instrument.py")
+    parser.add_argument("--memory", action="store_true",
+                        help="trace allocations of every part, see memory.py")
+    parser.add_argument("--memory-limit", action="append", default=[], metavar="[DAY=]MIB",
+                        help="address space each part may map beyond what is mapped before it starts, "
+                             "or the budget of the parts of one day")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    timings = run(args.days or discover(), args.jobs, args.inputs, args.profile,
+                  args.memory, memory.parse_limits(args.memory_limit))
+    report(timings, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()